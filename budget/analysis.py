@@ -2,7 +2,13 @@ from datetime import datetime
 from typing import Optional
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
+
+
+_EXCLUDE_COLS = ["id", "year", "month", "residents", "num_residents"]
+""" The columns of the rent data that are not expenses. """
+
+_RCOND = 1e-10
+""" Singular values of the features below this fraction of the largest are treated as zero. """
 
 
 def estimate_rent(df: pd.DataFrame, residents: int, dt: Optional[datetime]=None) -> pd.DataFrame:
@@ -11,6 +17,9 @@ def estimate_rent(df: pd.DataFrame, residents: int, dt: Optional[datetime]=None)
     datetime representing the year and month. If no datetime is provided, this function uses the
     current month.
 
+    Each expense is estimated with a linear model of the year, month, and number of residents. The
+    models share the same features, so all of them are fit at once by solving the normal equations.
+
     Args:
         df: a pandas dataframe containing the previous expense data
         dt: the datetime representing the year and month to estimate
@@ -20,37 +29,65 @@ def estimate_rent(df: pd.DataFrame, residents: int, dt: Optional[datetime]=None)
 
     Raises:
         AssertionError: if `dt` is in the past.
+        ValueError: if `df` is empty.
     """
+    if len(df) == 0:
+        raise ValueError("cannot estimate rent without any previous expense data")
     if dt is None:
         dt = datetime.now()
     else:
         assert dt >= datetime.now()
 
-    EXCLUDE_COLS = ["id", "year", "month", "residents", "num_residents"]
-    expenses_cols = df.columns.difference(EXCLUDE_COLS)
+    expenses_cols = df.columns.difference(_EXCLUDE_COLS)
 
-    df = df.fillna(df.mean(numeric_only=True))
+    FEATURE_COLS = ["year", "month", "num_residents"]
+    data = df[FEATURE_COLS + list(expenses_cols)].to_numpy(dtype=np.float64)
+
+    # replace missing values with the mean of their column, in place
+    missing = np.isnan(data)
+    if missing.any():
+        data[missing] = np.take(np.nanmean(data, axis=0), np.nonzero(missing)[1])
+
+    # center the features and expenses so the intercept drops out of the normal equations and
+    # the year column does not dominate their conditioning
+    data_mean = data.mean(axis=0)
+    data -= data_mean
+    x, y = data[:, :len(FEATURE_COLS)], data[:, len(FEATURE_COLS):]
+    x_mean, y_mean = data_mean[:len(FEATURE_COLS)], data_mean[len(FEATURE_COLS):]
+
+    # the rank is decided from the singular values of the features rather than from the normal
+    # equations, which square their condition number
+    singular_values = np.linalg.svd(x, compute_uv=False)
+    if np.count_nonzero(singular_values > _RCOND * singular_values[0]) == x.shape[1]:
+        coef = np.linalg.solve(x.T @ x, x.T @ y)
+    else:
+        # the features are rank deficient if one is constant (e.g., the number of residents never
+        # changed) or there are too few months, so fall back to the minimum norm least squares
+        # solution, discarding the singular values that are only rounding noise
+        coef, *_ = np.linalg.lstsq(x, y, rcond=_RCOND)
 
     estimate = pd.DataFrame({"year": [dt.year], "month": [dt.month]})
-    for expense in expenses_cols:
-        x = df[["year", "month", "num_residents"]]
-        y = df[expense]
-        model = LinearRegression()
-        model.fit(x.values, y)
-        estimate[expense] = model.predict([[dt.year, dt.month, residents]])
+    x_new = np.array([[dt.year, dt.month, residents]]) - x_mean
+    estimate[expenses_cols] = y_mean + x_new @ coef
 
     return estimate.round(2)
 
 
 def remove_outliers(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Removes outlier values from a given dataset. Values are considered outliers if they are more
-    than 3 standard deviations from the mean.
+    Removes the rows containing outlier values from a given dataset. Values are considered outliers
+    if they are more than 3 standard deviations from the mean. Only numeric expense columns are
+    checked; missing values are not considered outliers.
 
     Args:
         df: the dataset as a pandas dataframe
 
     Returns:
-        A pandas dataframe containing the data without the outliers.
+        A pandas dataframe containing the rows of the data without outliers.
     """
-    return df[np.abs(df - df.mean()) <= (3 * df.std())]
\ No newline at end of file
+    numeric = df.select_dtypes(include=np.number).drop(columns=_EXCLUDE_COLS, errors="ignore")
+    values = numeric.to_numpy(dtype=np.float64)
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0, ddof=1)
+    inliers = (np.abs(values - mean) <= 3 * std) | np.isnan(values)
+    return df.loc[inliers.all(axis=1)]
@@ -1,6 +1,41 @@
-import re
-from datetime import datetime
-from typing import Optional
+import functools, math, time
+from datetime import datetime, MINYEAR
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+
+_MONTH_NAMES = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+""" The lowercase English month names, in order. """
+
+_MONTH_BYTES = tuple(name.encode("ascii") for name in _MONTH_NAMES)
+""" The lowercase English month names as ASCII bytes, in order. """
+
+_MONTH_KEYS = {
+    name[0] << 16 | name[1] << 8 | name[2]: i for i, name in enumerate(_MONTH_BYTES, start=1)
+}
+""" A mapping of month abbreviations, packed into 24 bit integers, to month numbers. """
+
+_TO_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+""" A translation table from uppercase to lowercase ASCII letters. """
+
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+""" The ASCII whitespace characters, which are removed from month strings. """
+
+_CACHE_SIZE = 2**17
+""" The maximum number of cached results of each parser. """
+
+_YEAR_TTL = 60 * 60
+""" The number of seconds before the cached current year is refreshed. """
+
+_DT_CACHE: Dict[Tuple[int, int], datetime] = {}
+""" A cache of the datetimes returned by `parse_month_datetime`, keyed by year and month. """
+
+_year = datetime.now().year
+_year_time = time.monotonic()
 
 
 def parse_month_datetime(month_str: str) -> Optional[datetime]:
@@ -29,29 +64,93 @@ def parse_month_datetime(month_str: str) -> Optional[datetime]:
     Returns:
         The datetime if it can be parsed; otherwise `None`.
     """
-    formatted = re.sub(r"\s+", "", month_str, flags=re.UNICODE)
-    try:
-        return datetime.strptime(formatted, "%b%Y")
-    except ValueError:
-        pass
-    try:
-        return datetime.strptime(formatted, "%B%Y")
-    except ValueError:
-        pass
-    try:
-        dt = datetime.strptime(formatted, "%b")
-        dt = dt.replace(year=datetime.now().year)
-        return dt
-    except ValueError:
-        pass
-    try:
-        dt = datetime.strptime(formatted, "%B")
-        dt = dt.replace(year=datetime.now().year)
-        return dt
-    except ValueError:
-        pass
-    return None
+    parsed = _parse_month(month_str)
+    if parsed is None:
+        return None
+    year, month = parsed
+    if year is None:
+        year = _current_year()
+
+    # datetimes are immutable, so the same instance is returned for every string of a month
+    dt = _DT_CACHE.get((year, month))
+    if dt is None:
+        dt = _DT_CACHE[(year, month)] = datetime(year, month, 1)
+    return dt
 
+def parse_month_datetimes(month_strs: Iterable[str]) -> np.ndarray:
+    """
+    Parses the months of many strings at once. This is the vectorized equivalent of
+    `parse_month_datetime`, and accepts the same formats.
+
+    Args:
+        month_strs: the strings to parse
+
+    Returns:
+        A numpy array of `datetime64[D]` values for the first day of each month. Strings that
+        cannot be parsed are `NaT`.
+    """
+    parsed = [_parse_month(month_str) for month_str in month_strs]
+    years = np.empty(len(parsed), dtype=np.int32)
+    months = np.empty(len(parsed), dtype=np.int32)
+    valid = np.empty(len(parsed), dtype=bool)
+    current_year = _current_year()
+    for i, year_month in enumerate(parsed):
+        if year_month is None:
+            valid[i] = False
+            years[i], months[i] = 1970, 1
+        else:
+            valid[i] = True
+            year, months[i] = year_month
+            years[i] = current_year if year is None else year
+
+    dts = (years - 1970).astype("datetime64[Y]") + (months - 1).astype("timedelta64[M]")
+    dts = dts.astype("datetime64[D]")
+    dts[~valid] = np.datetime64("NaT")
+    return dts
+
+def _current_year() -> int:
+    """
+    Returns the current year. The year is cached and refreshed at most once an hour, so the
+    current date is not computed for every parsed month.
+    """
+    global _year, _year_time
+    now = time.monotonic()
+    if now - _year_time >= _YEAR_TTL:
+        _year, _year_time = datetime.now().year, now
+    return _year
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _parse_month(month_str: str) -> Optional[Tuple[Optional[int], int]]:
+    """
+    Parses the year and month numbers from a string. The year is `None` if the string only
+    contains a month. The result does not depend on the current date, so it is cached.
+    """
+    # month names are ASCII, so the string is lowercased and stripped of whitespace with a single
+    # byte translation rather than unicode aware string methods
+    if not month_str.isascii():
+        # unicode whitespace, such as a no-break space, is removed before rejecting the string
+        month_str = "".join(month_str.split())
+        if not month_str.isascii():
+            return None
+    formatted = month_str.encode("ascii").translate(_TO_LOWER, _WHITESPACE)
+
+    # the month is either the whole string, or followed by a 4 digit year
+    year = None
+    if len(formatted) > 4 and formatted[-4:].isdigit():
+        formatted, year = formatted[:-4], int(formatted[-4:])
+        if year < MINYEAR:
+            return None
+
+    # the first three letters are packed into an integer key, which is cheaper to hash than bytes;
+    # any other letters must spell out the rest of the full month name
+    if len(formatted) < 3:
+        return None
+    month = _MONTH_KEYS.get(formatted[0] << 16 | formatted[1] << 8 | formatted[2])
+    if month is None or (len(formatted) > 3 and formatted != _MONTH_BYTES[month - 1]):
+        return None
+    return year, month
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
 def parse_money(money: str) -> Optional[float]:
     """
     Parses a decimal value from a string representing an amount of money. Note `float` is not ideal
@@ -62,9 +161,49 @@ def parse_money(money: str) -> Optional[float]:
         money: the monetary value as a string
 
     Returns:
-        The monetary value as a float if it can be parsed; otherwise `None`.
+        The monetary value as a float if it can be parsed; otherwise `None`. Values that are not
+        numbers, including "nan" and "inf", cannot be parsed.
     """
+    money = money.strip("$").replace(",", "").strip()
+    if not money:
+        return None
+    # values that cannot start a number are rejected without raising an exception in float()
+    first = money[0]
+    if not ("0" <= first <= "9" or first in "+-."):
+        return None
     try:
-        return float(money.strip('$').replace(',', ''))
+        value = float(money)
     except ValueError:
-        return None
\ No newline at end of file
+        return None
+    # float() also accepts infinities, nan, digit separators and non-ASCII digits, none of which
+    # are amounts of money
+    if not math.isfinite(value) or "_" in money or not money.isascii():
+        return None
+    return value
+
+def parse_money_series(money: pd.Series) -> pd.Series:
+    """
+    Parses a series of strings representing amounts of money with `parse_monies`, keeping the index
+    of the series.
+
+    Args:
+        money: the monetary values as a series of strings
+
+    Returns:
+        The monetary values as a series of floats. Values that cannot be parsed are `NaN`.
+    """
+    return pd.Series(parse_monies(money.to_numpy()), index=money.index)
+
+def parse_monies(money: Sequence[str]) -> np.ndarray:
+    """
+    Parses a one dimensional array of strings representing amounts of money. Each value is parsed
+    by the cached `parse_money`, so both accept the same values; parsing with numpy string
+    operations or `pd.to_numeric` is slower than `float()` and only approximates its rules.
+
+    Args:
+        money: the monetary values as an array-like of strings
+
+    Returns:
+        The monetary values as a numpy array of floats. Values that cannot be parsed are `NaN`.
+    """
+    return np.array([parse_money(str(value)) for value in money], dtype=np.float64)
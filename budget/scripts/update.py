@@ -1,5 +1,7 @@
 from argparse import ArgumentParser
 import os, sqlite3, logging
+from typing import Optional
+import pandas as pd
 from budget import sheets
 
 logger = logging.getLogger(__name__)
@@ -12,6 +14,12 @@ logging.basicConfig(
     style='{'
 )
 
+RENT_TABLE_NAME = "rent"
+""" The table containing the monthly rent data. """
+
+SYNC_TABLE_NAME = "sync"
+""" The table recording the modified time of the spreadsheet at the last update. """
+
 def run():
     parser = ArgumentParser(
         prog="update-db",
@@ -26,21 +34,97 @@ def run():
     parser.add_argument("--client-secret", metavar="FILE", type=str,
             help="specify the client secret for the project (default: $CLIENT_SECRET)",
             default=os.getenv('CLIENT_SECRET'))
+    parser.add_argument("--force", action="store_true",
+            help="update the database even if the spreadsheet is unchanged since the last update")
 
     args = parser.parse_args()
 
-    df = sheets.get_spreadsheet_dataframe(args.sheet_id, args.client_secret)
-
-    con = sqlite3.connect(args.db, detect_types=sqlite3.PARSE_DECLTYPES)
+    # transactions are managed explicitly, so the connection is opened in autocommit mode
+    con = sqlite3.connect(args.db, detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
     logger.info(f"{args.db}: connection established")
 
-    TABLE_NAME = "rent"
-    df.to_sql(name=TABLE_NAME, con=con, if_exists="replace", dtype={"id": "INTEGER PRIMARY KEY"})
-    logger.info(f"{args.db}: dataframe written to '{TABLE_NAME}' table")
+    # a forced update does not need the modified time, so it does not depend on the drive api
+    modified_time = None
+    if not args.force:
+        modified_time = sheets.get_spreadsheet_modified_time(args.sheet_id, args.client_secret)
+        if get_synced_time(con, args.sheet_id) == modified_time:
+            logger.info(f"{args.db}: spreadsheet unchanged since {modified_time}, skipping update")
+            con.close()
+            return
+
+    df = sheets.get_spreadsheet_dataframe(args.sheet_id, args.client_secret)
+
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        write_rent_table(con, df)
+        if modified_time is not None:
+            set_synced_time(con, args.sheet_id, modified_time)
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    logger.info(f"{args.db}: dataframe written to '{RENT_TABLE_NAME}' table")
 
     con.close()
     logger.info(f"{args.db}: connection established")
 
 
+def write_rent_table(con: sqlite3.Connection, df: pd.DataFrame):
+    """
+    Writes the rows of the rent dataframe to the rent table, replacing existing rows with the same
+    id and deleting the rows of sheets that are no longer in the dataframe. The table is created
+    if it does not exist, and columns are added for any expenses that are not in the table yet.
+    """
+    con.execute(f'CREATE TABLE IF NOT EXISTS {RENT_TABLE_NAME} ("id" INTEGER PRIMARY KEY)')
+    existing = {row[1] for row in con.execute(f"PRAGMA table_info({RENT_TABLE_NAME})")}
+    for column, dtype in df.dtypes.items():
+        if column not in existing:
+            con.execute(
+                f"ALTER TABLE {RENT_TABLE_NAME} ADD COLUMN {quote(column)} {sqlite_type(dtype)}"
+            )
+
+    ids = df.index.tolist()
+    con.execute(
+        f"DELETE FROM {RENT_TABLE_NAME} WHERE id NOT IN ({', '.join('?' * len(ids))})", ids
+    )
+    columns = ", ".join(quote(column) for column in ["id", *df.columns])
+    params = ", ".join("?" * (len(df.columns) + 1))
+    con.executemany(
+        f"INSERT OR REPLACE INTO {RENT_TABLE_NAME} ({columns}) VALUES ({params})",
+        df.itertuples(index=True, name=None)
+    )
+
+def quote(name: str) -> str:
+    """ Quotes a column name as an SQLite identifier, doubling any embedded quotes. """
+    return '"' + name.replace('"', '""') + '"'
+
+def sqlite_type(dtype) -> str:
+    """ Returns the SQLite column type used to store values of a pandas dtype. """
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+def get_synced_time(con: sqlite3.Connection, spreadsheet_id: str) -> Optional[str]:
+    """ Returns the modified time of the spreadsheet when it was last written to the database. """
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {SYNC_TABLE_NAME} "
+        "(spreadsheet_id TEXT PRIMARY KEY, modified_time TEXT)"
+    )
+    row = con.execute(
+        f"SELECT modified_time FROM {SYNC_TABLE_NAME} WHERE spreadsheet_id = ?", (spreadsheet_id,)
+    ).fetchone()
+    return row[0] if row else None
+
+def set_synced_time(con: sqlite3.Connection, spreadsheet_id: str, modified_time: str):
+    """ Records the modified time of the spreadsheet that was written to the database. """
+    con.execute(
+        f"INSERT OR REPLACE INTO {SYNC_TABLE_NAME} VALUES (?, ?)", (spreadsheet_id, modified_time)
+    )
+
+
 if __name__ == "__main__":
     run()
\ No newline at end of file
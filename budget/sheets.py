@@ -2,10 +2,10 @@
 This module provides functions for retrieving rent data from a shared google sheets spreadsheet.
 """
 
-import json, logging
-import concurrent.futures
-from typing import Optional, Tuple
+import bisect, functools, json, logging, math
+from typing import Any, Dict, List, Optional, Tuple
 import gspread
+from gspread.utils import absolute_range_name
 import pandas as pd
 from datetime import datetime
 from budget.parsers import parse_month_datetime, parse_money
@@ -40,6 +40,23 @@ _GROCERY_LOC_MAP = {
 }
 """ A mapping of cell locations to the date range they are valid for. """
 
+_GROCERY_RANGES = sorted(
+    (r.start.year * 12 + r.start.month - 1, r.end.year * 12 + r.end.month - 1, a1)
+    for r, a1 in _GROCERY_LOC_MAP.items()
+)
+""" The grocery cell locations as (start, end, a1) tuples of month ordinals, sorted by start. """
+
+_GROCERY_STARTS = [start for start, _, _ in _GROCERY_RANGES]
+""" The start month ordinals of `_GROCERY_RANGES`, used for binary search. """
+
+_COLS_DTYPE = {
+    "year": "int16",
+    "month": "int8",
+    "residents": "string",
+    "num_residents": "int8",
+}
+""" The dtypes of the non-expense columns. Expense columns are always float64. """
+
 _SPLIT_RENT = {
     2064860783,
     944604678,
@@ -74,82 +91,169 @@ def get_spreadsheet_dataframe(spreadsheet_id: str, client_secret: str) -> pd.Dat
         gspread.exceptions.SpreadsheetNotFound: if `SHEET_KEY` is not valid
         gspread.exceptions.APIError: if the client receives an error code from the API
     """
-    logger.info(f"Attempting to connect to google")
-    client = gspread.oauth(credentials_filename=client_secret)
-    logger.info(f"Client connection established, id: {client.auth.client_id}")
+    spreadsheet = get_spreadsheet(spreadsheet_id, client_secret)
+    # filter out excluded worksheets and worksheets without a month title before building ranges;
+    # the title of each worksheet is parsed once
+    candidates = [
+        (sheet, dt) for sheet in spreadsheet.worksheets()
+        if sheet.title not in _EXCLUDED_SHEETS
+        and (dt := parse_month_datetime(sheet.title)) is not None
+    ]
+
+    # collect the ranges of every worksheet so they can be fetched with a single request
+    requests = []
+    ranges = []
+    for sheet, dt in candidates:
+        sheet_ranges = get_sheet_ranges(sheet.title, dt)
+        requests.append((sheet.id, dt, len(sheet_ranges)))
+        ranges.extend(sheet_ranges)
+
+    logger.info(f"Fetching {len(requests)} sheets from {spreadsheet_id}")
+    result = spreadsheet.values_batch_get(ranges) if ranges else {}
+    values = [r.get("values", []) for r in result.get("valueRanges", [])]
+
+    # the value ranges are returned in the same order they were requested
+    ids = []
+    rows = []
+    offset = 0
+    for sheet_id, dt, num_ranges in requests:
+        row = build_row_from_values(dt, sheet_id, values[offset:offset + num_ranges])
+        offset += num_ranges
+        if row is not None:
+            ids.append(sheet_id)
+            rows.append(row)
+
+    if not rows:
+        return pd.DataFrame()
+
+    # build each column directly with its final dtype, rather than inferring it from the rows
+    columns = dict.fromkeys(col for row in rows for col in row)
+    data = {
+        col: pd.array([row.get(col) for row in rows], dtype=_COLS_DTYPE.get(col, "float64"))
+        for col in columns
+    }
+    return pd.DataFrame(data, index=pd.Index(ids, dtype="int64", name="id"))
+
+def get_spreadsheet_modified_time(spreadsheet_id: str, client_secret: str) -> str:
+    """
+    Gets the time the google sheets spreadsheet with a key of `spreadsheet_id` was last modified.
+    This can be compared against the time of a previous update to skip fetching unchanged data.
+
+    Args:
+        spreadsheet_id: the key of a google sheets spreadsheet as it appears in the URL
+        client_secret: the path of the client secret JSON file
+
+    Returns:
+        The modified time as an RFC 3339 timestamp.
+    """
+    return get_spreadsheet(spreadsheet_id, client_secret).get_lastUpdateTime()
+
+@functools.lru_cache(maxsize=1)
+def get_spreadsheet(spreadsheet_id: str, client_secret: str) -> gspread.Spreadsheet:
+    """
+    Opens the google sheets spreadsheet with a key of `spreadsheet_id`. The spreadsheet is cached,
+    so its metadata is only fetched once per process.
 
-    spreadsheet = client.open_by_key(spreadsheet_id)
-    sheets = [s for s in spreadsheet.worksheets() if s.title not in _EXCLUDED_SHEETS]
+    Raises:
+        gspread.exceptions.SpreadsheetNotFound: if `spreadsheet_id` is not valid
+    """
+    return get_client(client_secret).open_by_key(spreadsheet_id)
 
-    logger.info(f"Fetching sheets from {spreadsheet_id}")
-    # get the data from worksheets concurrently
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        month_futures = {executor.submit(get_sheet_dataframe, s) for s in sheets if s.title}
-        df = pd.DataFrame()
-        for future in concurrent.futures.as_completed(month_futures):
-            data = future.result()
-            df = pd.concat([df, data])
+@functools.lru_cache(maxsize=1)
+def get_client(client_secret: str) -> gspread.Client:
+    """
+    Authorizes a google sheets client using the credentials from the file `client_secret`. The
+    client is cached, so the authorization and its connection are reused within a process.
 
-    client.session.close()
-    logger.info(f"Client connection closed, id: {client.auth.client_id}")
-    return df
+    Raises:
+        FileNotFoundError: if `client_secret` is not found.
+    """
+    logger.info(f"Attempting to connect to google")
+    client = gspread.oauth(credentials_filename=client_secret)
+    logger.info(f"Client connection established, id: {client.auth.client_id}")
+    return client
 
-def get_sheet_dataframe(sheet: gspread.Worksheet) -> Optional[pd.DataFrame]:
+def get_sheet_ranges(title: str, dt: datetime) -> List[str]:
     """
-    Gets the monthly rent data from a given sheet/tab. Sheets are expected to have titles with
-    the format "%b%Y" or "%B%Y" (e.g., "Apr2020", "April2020").
+    Returns the ranges, in A1 notation, containing the monthly rent data of a given sheet/tab.
 
     Args:
-        sheet: the spreadsheet sheet/tab
+        title: the title of the sheet/tab
+        dt: the datetime representing the year and month of the sheet
 
     Returns:
-        A pandas dataframe containing the monthly rent data as a single row if the worksheet title
-        is valid; otherwise `None`.
+        A list containing the expenses, residents, and, if the sheet has them, grocery ranges.
     """
     EXPENSES_A1 = "A2:B6"
     RESIDENTS_A1 = "B1:E1"
 
-    dt = parse_month_datetime(sheet.title)
-    if dt is None:
-        return None
-
+    ranges = [EXPENSES_A1, RESIDENTS_A1]
     groceries_a1 = get_grocery_a1(dt)
-    result = sheet.batch_get([EXPENSES_A1, RESIDENTS_A1, groceries_a1])
-    if len(result) == 2:
-        [expenses, residents] = result
+    if groceries_a1 is not None:
+        ranges.append(groceries_a1)
+    return [absolute_range_name(title, a1) for a1 in ranges]
+
+def build_row_from_values(
+    dt: datetime, sheet_id: int, values: List[list]
+) -> Optional[Dict[str, Any]]:
+    """
+    Builds the monthly rent data of a sheet/tab from the values of its ranges. Sheets are expected
+    to have titles with the format "%b%Y" or "%B%Y" (e.g., "Apr2020", "April2020").
+
+    Args:
+        dt: the datetime representing the year and month of the sheet
+        sheet_id: the id of the sheet/tab
+        values: the values of the ranges returned by `get_sheet_ranges`, in the same order
+
+    Returns:
+        A dictionary containing the monthly rent data of the sheet, keyed by column name, if the
+        values are valid; otherwise `None`.
+    """
+    if len(values) == 2:
+        [expenses, residents] = values
         groceries = []
-    elif len(result) == 3:
-        [expenses, residents, groceries] = result
+    elif len(values) == 3:
+        [expenses, residents, groceries] = values
     else:
         return None
 
     data = {
-        "id": sheet.id,
-        "year": [dt.year],
-        "month": [dt.month],
-        "residents": json.dumps(residents[0]),
+        "year": dt.year,
+        "month": dt.month,
+        "residents": dump_residents(tuple(residents[0])),
         "num_residents": len(residents[0]),
     }
-    data.update({exp[0].lower(): parse_money(exp[1]) for exp in expenses if len(exp) == 2})
+    # a sheet only has a handful of values, which the cached scalar parser handles faster than
+    # building a series for them
+    for exp in expenses:
+        if len(exp) == 2:
+            amount = parse_money(exp[1])
+            data[exp[0].lower()] = math.nan if amount is None else amount
 
-    if sheet.id in _SPLIT_RENT:
+    if sheet_id in _SPLIT_RENT:
         data["rent"] = data["rent"] * data["num_residents"]
 
     if len(groceries) > 0:
         parsed = map(parse_money, groceries[0])
-        data["groceries"] = sum(parsed)
+        data["groceries"] = math.fsum(amount for amount in parsed if amount is not None)
 
-    df = pd.DataFrame(data)
-    df.set_index(["id"], inplace=True)
+    logger.info(f"Loaded data from sheet {sheet_id}")
+    return data
 
-    logger.info(f"Loaded data from sheet {sheet.id}")
-    return df
+@functools.lru_cache(maxsize=64)
+def dump_residents(residents: Tuple[str, ...]) -> str:
+    """
+    Serializes the residents of a sheet as a JSON array. Most months share the same residents, so
+    the serialized values are cached.
+    """
+    return json.dumps(list(residents))
 
 def get_grocery_a1(dt: datetime) -> Optional[str]:
     """
     Returns the A1 notation for the grocery values based on a given datetime.
     """
-    for dt_range in _GROCERY_LOC_MAP:
-        if dt_range.contains(dt):
-            return _GROCERY_LOC_MAP[dt_range]
+    month = dt.year * 12 + dt.month - 1
+    i = bisect.bisect_right(_GROCERY_STARTS, month) - 1
+    if i >= 0 and month < _GROCERY_RANGES[i][1]:
+        return _GROCERY_RANGES[i][2]
     return None
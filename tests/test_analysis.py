@@ -0,0 +1,84 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from budget import analysis
+
+
+@pytest.fixture
+def rent_df():
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6],
+        "year": [2020, 2020, 2021, 2021, 2022, 2022],
+        "month": [1, 6, 3, 9, 2, 11],
+        "residents": ['["a", "b"]'] * 6,
+        "num_residents": [2, 3, 3, 2, 4, 3],
+        "rent": [2000.0, 2050.0, 2100.0, 2080.0, 2200.0, 2250.0],
+        "power": [80.5, 40.25, 60.0, 45.75, 90.0, None],
+    })
+
+
+# expected values were produced by the previous scikit-learn LinearRegression implementation
+def test_estimate_rent(rent_df):
+    estimate = analysis.estimate_rent(rent_df, 3, datetime(2030, 1, 1))
+    assert estimate.to_dict("records") == [
+        {"year": 2030, "month": 1, "power": 254.09, "rent": 2737.24}
+    ]
+
+
+@pytest.mark.parametrize("residents", [3, 4])
+def test_estimate_rent_constant_feature(rent_df, residents):
+    rent_df["num_residents"] = 3
+    estimate = analysis.estimate_rent(rent_df, residents, datetime(2030, 1, 1))
+    assert estimate.to_dict("records") == [
+        {"year": 2030, "month": 1, "power": 206.65, "rent": 2953.34}
+    ]
+
+
+# with at most 3 months, the centered features are rank deficient
+@pytest.mark.parametrize("num_rows, rent", [
+    pytest.param(1, 1987.15, id="1 month"),
+    pytest.param(2, 2030.59, id="2 months"),
+    pytest.param(3, 2479.56, id="3 months"),
+])
+def test_estimate_rent_few_months(num_rows, rent):
+    df = pd.DataFrame({
+        "id": [1, 2, 3],
+        "year": [2023, 2019, 2019],
+        "month": [11, 1, 7],
+        "residents": ['["a"]', '["a", "b"]', '["a", "b"]'],
+        "num_residents": [1, 2, 2],
+        "rent": [1987.15, 2136.65, 1933.48],
+    })
+    estimate = analysis.estimate_rent(df.iloc[:num_rows], 3, datetime(2030, 5, 1))
+    assert estimate.to_dict("records") == [{"year": 2030, "month": 5, "rent": rent}]
+
+
+def test_estimate_rent_empty(rent_df):
+    with pytest.raises(ValueError):
+        analysis.estimate_rent(rent_df.iloc[:0], 3, datetime(2030, 1, 1))
+
+
+@pytest.fixture
+def expenses_df():
+    return pd.DataFrame({
+        "id": range(20),
+        "year": [2020 + i // 12 for i in range(20)],
+        "month": [i % 12 + 1 for i in range(20)],
+        "residents": pd.array(['["a", "b"]'] * 20, dtype="string"),
+        "num_residents": [2, 3] * 10,
+        "rent": [2000.0, 2010.0, 1990.0, 2005.0] * 5,
+        "power": [50.0, 55.0, 45.0, 60.0] * 5,
+    })
+
+
+def test_remove_outliers(expenses_df):
+    expenses_df.loc[7, "power"] = 1000.0
+    assert analysis.remove_outliers(expenses_df)["id"].tolist() == [
+        i for i in range(20) if i != 7
+    ]
+
+
+def test_remove_outliers_missing_values(expenses_df):
+    expenses_df.loc[3, ["rent", "power"]] = None
+    expenses_df.loc[11, "power"] = None
+    pd.testing.assert_frame_equal(analysis.remove_outliers(expenses_df), expenses_df)
@@ -1,93 +1,121 @@
-from unittest import TestCase
 from datetime import datetime
+import numpy as np
+import pandas as pd
+import pytest
 from budget import parsers
 
 
-class ParseSheetTitleTestCase(TestCase):
-    def test_parse_title_short(self):
-        with self.subTest("uppercase"):
-            dt = parsers.parse_month_datetime("JAN2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("lowercase"):
-            dt = parsers.parse_month_datetime("jan2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("capitalized"):
-            dt = parsers.parse_month_datetime("Jan2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("mixed case"):
-            dt = parsers.parse_month_datetime("jAn2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("only month"):
-            dt = parsers.parse_month_datetime("Jan")
-            self.assertEqual(dt, datetime(datetime.now().year, 1, 1))
-
-    def test_parse_title_long(self):
-        with self.subTest("uppercase"):
-            dt = parsers.parse_month_datetime("JANUARY2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("lowercase"):
-            dt = parsers.parse_month_datetime("january2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("capitalized"):
-            dt = parsers.parse_month_datetime("January2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("mixed case"):
-            dt = parsers.parse_month_datetime("jAnUAry2020")
-            self.assertEqual(dt, datetime(2020, 1, 1))
-
-        with self.subTest("only month"):
-            dt = parsers.parse_month_datetime("January")
-            self.assertEqual(dt, datetime(datetime.now().year, 1, 1))
-
-    def test_parse_title_invalid(self):
-        with self.subTest("empty title"):
-            dt = parsers.parse_month_datetime("")
-            self.assertEqual(dt, None)
-
-        with self.subTest("missing month"):
-            dt = parsers.parse_month_datetime("2020")
-            self.assertEqual(dt, None)
-
-        with self.subTest("invalid month"):
-            dt = parsers.parse_month_datetime("asd2020")
-            self.assertEqual(dt, None)
-
-        with self.subTest("invalid year"):
-            dt = parsers.parse_month_datetime("feb202020")
-            self.assertEqual(dt, None)
-
-
-class ParseMoneyTestCase(TestCase):
-    def test_parse_money_invalid(self):
-        with self.subTest("empty string"):
-            dt = parsers.parse_money("")
-            self.assertEqual(dt, None)
-
-        with self.subTest("non-numeric"):
-            dt = parsers.parse_money("hello world")
-            self.assertEqual(dt, None)
-
-    def test_parse_title_no_symbol(self):
-        with self.subTest("integer"):
-            dt = parsers.parse_money("5")
-            self.assertEqual(dt, 5.0)
-
-        with self.subTest("trailing zeros"):
-            dt = parsers.parse_money("5.00")
-            self.assertEqual(dt, 5.0)
-
-        with self.subTest("decimal value"):
-            dt = parsers.parse_money("5.67")
-            self.assertEqual(dt, 5.67)
-
-    def test_parse_money_currency_symbol(self):
-        with self.subTest("decimal value"):
-            dt = parsers.parse_money("$5.67")
-            self.assertEqual(dt, 5.67)
\ No newline at end of file
+CURRENT_YEAR = 2019
+""" The current year used by the parsers for strings without a year. """
+
+@pytest.fixture(autouse=True)
+def current_year(monkeypatch):
+    monkeypatch.setattr(parsers, "_current_year", lambda: CURRENT_YEAR)
+
+
+@pytest.mark.parametrize("month_str, expected", [
+    pytest.param("JAN2020", datetime(2020, 1, 1), id="uppercase"),
+    pytest.param("jan2020", datetime(2020, 1, 1), id="lowercase"),
+    pytest.param("Jan2020", datetime(2020, 1, 1), id="capitalized"),
+    pytest.param("jAn2020", datetime(2020, 1, 1), id="mixed case"),
+    pytest.param("Jan", datetime(CURRENT_YEAR, 1, 1), id="only month"),
+])
+def test_parse_title_short(month_str, expected):
+    assert parsers.parse_month_datetime(month_str) == expected
+
+
+@pytest.mark.parametrize("month_str, expected", [
+    pytest.param("JANUARY2020", datetime(2020, 1, 1), id="uppercase"),
+    pytest.param("january2020", datetime(2020, 1, 1), id="lowercase"),
+    pytest.param("January2020", datetime(2020, 1, 1), id="capitalized"),
+    pytest.param("jAnUAry2020", datetime(2020, 1, 1), id="mixed case"),
+    pytest.param("January", datetime(CURRENT_YEAR, 1, 1), id="only month"),
+])
+def test_parse_title_long(month_str, expected):
+    assert parsers.parse_month_datetime(month_str) == expected
+
+
+@pytest.mark.parametrize("month_str, expected", [
+    pytest.param("Apr 2020", datetime(2020, 4, 1), id="space"),
+    pytest.param(" April\t2020 ", datetime(2020, 4, 1), id="ascii whitespace"),
+    pytest.param("Apr\u00a02020", datetime(2020, 4, 1), id="no-break space"),
+    pytest.param("Apr\u20032020", datetime(2020, 4, 1), id="em space"),
+])
+def test_parse_title_whitespace(month_str, expected):
+    assert parsers.parse_month_datetime(month_str) == expected
+
+
+@pytest.mark.parametrize("month_str", [
+    pytest.param("", id="empty title"),
+    pytest.param("2020", id="missing month"),
+    pytest.param("asd2020", id="invalid month"),
+    pytest.param("feb202020", id="invalid year"),
+    pytest.param("Äpr2020", id="non-ascii month"),
+])
+def test_parse_title_invalid(month_str):
+    assert parsers.parse_month_datetime(month_str) is None
+
+
+def test_parse_titles():
+    dts = parsers.parse_month_datetimes(["Jan2020", "february 2021", "Mar", "asd2020"])
+    expected = np.array(
+        ["2020-01-01", "2021-02-01", f"{CURRENT_YEAR}-03-01", "NaT"], dtype="datetime64[D]"
+    )
+    np.testing.assert_array_equal(dts, expected)
+
+
+@pytest.mark.parametrize("money", [
+    pytest.param("", id="empty string"),
+    pytest.param("hello world", id="non-numeric"),
+    pytest.param("nan", id="not a number"),
+    pytest.param("inf", id="infinity"),
+    pytest.param("-inf", id="negative infinity"),
+    pytest.param("1_000", id="digit separator"),
+    pytest.param("5\u0661", id="non-ascii digit"),
+])
+def test_parse_money_invalid(money):
+    assert parsers.parse_money(money) is None
+
+
+@pytest.mark.parametrize("money, expected", [
+    pytest.param("5", 5.0, id="integer"),
+    pytest.param("5.00", 5.0, id="trailing zeros"),
+    pytest.param("5.67", 5.67, id="decimal value"),
+    pytest.param("-5.67", -5.67, id="negative value"),
+    pytest.param(" 5", 5.0, id="leading whitespace"),
+])
+def test_parse_money_no_symbol(money, expected):
+    assert parsers.parse_money(money) == expected
+
+
+@pytest.mark.parametrize("money, expected", [
+    pytest.param("$5.67", 5.67, id="leading symbol"),
+    pytest.param("5$", 5.0, id="trailing symbol"),
+    pytest.param("$$5", 5.0, id="repeated symbol"),
+])
+def test_parse_money_currency_symbol(money, expected):
+    assert parsers.parse_money(money) == expected
+
+
+def test_parse_money_series():
+    parsed = parsers.parse_money_series(pd.Series(["$5.67", "5", "$1,234.50"]))
+    assert parsed.tolist() == [5.67, 5.0, 1234.5]
+
+    parsed = parsers.parse_money_series(pd.Series(["", "hello world"]))
+    assert parsed.isna().all()
+
+
+def test_parse_monies():
+    parsed = parsers.parse_monies(["$5.67", "5", "$1,234.50", "", "hello world"])
+    np.testing.assert_array_equal(parsed, [5.67, 5.0, 1234.5, np.nan, np.nan])
+
+
+@pytest.mark.parametrize("money", [
+    "$1,234.50", "5$", "$$5", " 5", "5 ", "$ 5", " $5.67", "5$5", "-$5", "1e3", "1_000", "nan",
+    "-inf", "", "hello world",
+])
+def test_parse_monies_matches_parse_money(money):
+    expected = parsers.parse_money(money)
+    np.testing.assert_array_equal(
+        parsers.parse_monies([money]), [np.nan if expected is None else expected]
+    )
@@ -1,4 +1,6 @@
 from unittest import TestCase
+from datetime import datetime
+from budget import sheets
 
 
 class SheetsTestCase(TestCase):
@@ -9,4 +11,92 @@ class SheetsTestCase(TestCase):
         pass
 
     def test_get_spreadsheet(self):
-        pass
\ No newline at end of file
+        pass
+
+
+class GetSheetRangesTestCase(TestCase):
+    def test_with_groceries(self):
+        ranges = sheets.get_sheet_ranges("Jan2023", datetime(2023, 1, 1))
+        self.assertEqual(ranges, ["'Jan2023'!A2:B6", "'Jan2023'!B1:E1", "'Jan2023'!E7"])
+
+    def test_without_groceries(self):
+        ranges = sheets.get_sheet_ranges("Jan2020", datetime(2020, 1, 1))
+        self.assertEqual(ranges, ["'Jan2020'!A2:B6", "'Jan2020'!B1:E1"])
+
+    def test_quoted_title(self):
+        ranges = sheets.get_sheet_ranges("Jan'2020", datetime(2020, 1, 1))
+        self.assertEqual(ranges[0], "'Jan''2020'!A2:B6")
+
+
+class BuildRowFromValuesTestCase(TestCase):
+    EXPENSES = [["Rent", "$1,000.00"], ["Power", "$50.50"], ["Internet"]]
+    RESIDENTS = [["a", "b"]]
+
+    def test_without_groceries(self):
+        row = sheets.build_row_from_values(
+            datetime(2020, 1, 1), 1, [self.EXPENSES, self.RESIDENTS]
+        )
+        self.assertEqual(row, {
+            "year": 2020,
+            "month": 1,
+            "residents": '["a", "b"]',
+            "num_residents": 2,
+            "rent": 1000.0,
+            "power": 50.5,
+        })
+
+    def test_groceries(self):
+        with self.subTest("valid values"):
+            row = sheets.build_row_from_values(
+                datetime(2023, 1, 1), 1, [self.EXPENSES, self.RESIDENTS, [["$1.50", "$2"]]]
+            )
+            self.assertEqual(row["groceries"], 3.5)
+
+        with self.subTest("invalid value"):
+            row = sheets.build_row_from_values(
+                datetime(2023, 1, 1), 1, [self.EXPENSES, self.RESIDENTS, [["$1.50", "n/a"]]]
+            )
+            self.assertEqual(row["groceries"], 1.5)
+
+    def test_split_rent(self):
+        sheet_id = next(iter(sheets._SPLIT_RENT))
+        row = sheets.build_row_from_values(
+            datetime(2021, 1, 1), sheet_id, [self.EXPENSES, self.RESIDENTS]
+        )
+        self.assertEqual(row["rent"], 2000.0)
+
+    def test_invalid_values(self):
+        row = sheets.build_row_from_values(datetime(2020, 1, 1), 1, [self.EXPENSES])
+        self.assertIsNone(row)
+
+
+class GetGroceryA1TestCase(TestCase):
+    def test_range_edges(self):
+        with self.subTest("before first range"):
+            self.assertIsNone(sheets.get_grocery_a1(datetime(2020, 2, 1)))
+
+        with self.subTest("start of range"):
+            self.assertEqual(sheets.get_grocery_a1(datetime(2020, 3, 1)), "B7:D7")
+
+        with self.subTest("end of range"):
+            self.assertEqual(sheets.get_grocery_a1(datetime(2020, 7, 31)), "B7:D7")
+
+        with self.subTest("adjacent ranges"):
+            self.assertEqual(sheets.get_grocery_a1(datetime(2021, 1, 1)), "F7")
+            self.assertEqual(sheets.get_grocery_a1(datetime(2021, 2, 1)), "M7")
+            self.assertEqual(sheets.get_grocery_a1(datetime(2021, 3, 1)), "F7")
+
+        with self.subTest("end of last range"):
+            self.assertEqual(sheets.get_grocery_a1(datetime(2034, 12, 1)), "E7")
+            self.assertIsNone(sheets.get_grocery_a1(datetime(2035, 1, 1)))
+
+    def test_gaps(self):
+        for dt in [
+            datetime(2020, 8, 1),
+            datetime(2021, 5, 1),
+            datetime(2021, 6, 1),
+            datetime(2021, 7, 1),
+            datetime(2022, 9, 1),
+        ]:
+            with self.subTest(dt.strftime("%Y-%m")):
+                self.assertIsNone(sheets.get_grocery_a1(dt))
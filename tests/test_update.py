@@ -0,0 +1,124 @@
+import sqlite3
+import pandas as pd
+import pytest
+from budget import sheets
+from budget.scripts import update
+
+
+class FakeWorksheet:
+    def __init__(self, title, id):
+        self.title = title
+        self.id = id
+
+
+class FakeSpreadsheet:
+    def __init__(self, modified_time, rent):
+        self.modified_time = modified_time
+        self.rent = rent
+
+    def get_lastUpdateTime(self):
+        if self.modified_time is None:
+            raise AssertionError("the modified time should not be requested")
+        return self.modified_time
+
+    def worksheets(self):
+        return [FakeWorksheet("Jan2023", 1), FakeWorksheet("Feb2023", 2)]
+
+    def values_batch_get(self, ranges):
+        values = [
+            [["Rent", self.rent], ["Power", "$50.00"]],
+            [["a", "b"]],
+            [["$100.00"]],
+        ]
+        return {"valueRanges": [{"values": v} for v in values * 2]}
+
+
+class FakeConnection:
+    """ Wraps an in-memory connection so the database outlives `close` between runs. """
+    def __init__(self):
+        self.con = sqlite3.connect(":memory:", isolation_level=None)
+
+    def __getattr__(self, name):
+        return getattr(self.con, name)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def con(monkeypatch):
+    con = FakeConnection()
+    monkeypatch.setattr(update.sqlite3, "connect", lambda *args, **kwargs: con)
+    yield con
+    con.con.close()
+
+
+def run(monkeypatch, spreadsheet, *args):
+    monkeypatch.setattr(sheets, "get_spreadsheet", lambda *args: spreadsheet)
+    monkeypatch.setattr("sys.argv", ["update-db", "--db", ":memory:", "--sheet-id", "sheet",
+                                     "--client-secret", "secret.json", *args])
+    update.run()
+
+
+def select_rent(con):
+    return con.execute("SELECT id, rent FROM rent ORDER BY id").fetchall()
+
+
+def test_run_first_update(monkeypatch, con):
+    run(monkeypatch, FakeSpreadsheet("2023-03-01T00:00:00Z", "$1,000.00"))
+    assert select_rent(con) == [(1, 1000.0), (2, 1000.0)]
+    assert update.get_synced_time(con, "sheet") == "2023-03-01T00:00:00Z"
+
+
+def test_run_unchanged_skips(monkeypatch, con):
+    run(monkeypatch, FakeSpreadsheet("2023-03-01T00:00:00Z", "$1,000.00"))
+    run(monkeypatch, FakeSpreadsheet("2023-03-01T00:00:00Z", "$2,000.00"))
+    assert select_rent(con) == [(1, 1000.0), (2, 1000.0)]
+
+
+def test_run_changed_updates(monkeypatch, con):
+    run(monkeypatch, FakeSpreadsheet("2023-03-01T00:00:00Z", "$1,000.00"))
+    run(monkeypatch, FakeSpreadsheet("2023-04-01T00:00:00Z", "$2,000.00"))
+    assert select_rent(con) == [(1, 2000.0), (2, 2000.0)]
+    assert update.get_synced_time(con, "sheet") == "2023-04-01T00:00:00Z"
+
+
+def test_run_force_updates(monkeypatch, con):
+    run(monkeypatch, FakeSpreadsheet("2023-03-01T00:00:00Z", "$1,000.00"))
+    run(monkeypatch, FakeSpreadsheet(None, "$2,000.00"), "--force")
+    assert select_rent(con) == [(1, 2000.0), (2, 2000.0)]
+    # the modified time is not requested, so the last synced time is kept
+    assert update.get_synced_time(con, "sheet") == "2023-03-01T00:00:00Z"
+
+
+def test_run_force_first_update(monkeypatch, con):
+    run(monkeypatch, FakeSpreadsheet(None, "$1,000.00"), "--force")
+    assert select_rent(con) == [(1, 1000.0), (2, 1000.0)]
+    assert update.get_synced_time(con, "sheet") is None
+
+
+def test_write_rent_table():
+    con = sqlite3.connect(":memory:")
+    update.write_rent_table(con, pd.DataFrame({
+        "year": pd.array([2023, 2023], dtype="int16"),
+        "residents": pd.array(['["a"]', '["a", "b"]'], dtype="string"),
+        "rent": [1000.0, 2000.0],
+    }, index=pd.Index([1, 2], dtype="int64", name="id")))
+    update.write_rent_table(con, pd.DataFrame({
+        "year": pd.array([2023, 2023], dtype="int16"),
+        "residents": pd.array(['["a", "b"]', '["a", "b"]'], dtype="string"),
+        "rent": [2000.0, 2000.0],
+        'water "city"': [30.0, 40.0],
+    }, index=pd.Index([2, 3], dtype="int64", name="id")))
+
+    schema = [row[1:3] for row in con.execute("PRAGMA table_info(rent)")]
+    assert schema == [
+        ("id", "INTEGER"), ("year", "INTEGER"), ("residents", "TEXT"), ("rent", "REAL"),
+        ('water "city"', "REAL"),
+    ]
+    # the row of sheet 1 is deleted, as it is no longer in the spreadsheet
+    assert con.execute("SELECT * FROM rent ORDER BY id").fetchall() == [
+        (2, 2023, '["a", "b"]', 2000.0, 30.0),
+        (3, 2023, '["a", "b"]', 2000.0, 40.0),
+    ]
+    con.close()